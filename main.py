@@ -1,6 +1,9 @@
 from src.utils import (search_vacancies, get_user_action, handle_action, create_database,
                        fill_database_with_companies_and_vacancies, check_database_exists)
 from src.db_manager import DBManager
+from src.scheduler import RefreshScheduler, load_watchlist, WATCHLIST_FILE
+import argparse
+import psycopg2
 
 
 def welcome_message():
@@ -84,10 +87,45 @@ def returning_user_actions():
         return returning_user_actions()  # Рекурсивный вызов функции для правильного выбора действия
 
 
+def run_scheduler(database_name, watchlist_file, max_workers):
+    """
+    Запускает фоновое периодическое обновление базы данных по списку отслеживаемых работодателей.
+    """
+    try:
+        watchlist = load_watchlist(watchlist_file)
+    except FileNotFoundError:
+        print(f"Файл со списком отслеживания '{watchlist_file}' не найден. "
+              f"Создайте его по образцу из README.md и запустите планировщик снова.")
+        return
+    except (OSError, ValueError) as e:  # Включая json.JSONDecodeError
+        print(f"Произошла ошибка при чтении списка отслеживания '{watchlist_file}': {e}")
+        return
+
+    create_database(database_name)
+    try:
+        scheduler = RefreshScheduler(database_name, watchlist, max_workers=max_workers)
+    except psycopg2.Error as e:
+        print(f"Произошла ошибка при подключении к базе данных: {e}")
+        return
+    scheduler.run()
+
+
 def main():
     """
     Основная функция приложения.
     """
+    parser = argparse.ArgumentParser(description="Приложение для поиска вакансий на hh.ru")
+    parser.add_argument("--scheduler", metavar="DATABASE",
+                        help="запустить фоновое обновление указанной базы данных по списку отслеживания")
+    parser.add_argument("--watchlist", default=WATCHLIST_FILE, help="путь к файлу со списком отслеживания")
+    parser.add_argument("--workers", type=int, default=4, help="количество одновременных обновлений")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("количество одновременных обновлений (--workers) должно быть не меньше 1")
+    if args.scheduler:
+        run_scheduler(args.scheduler, args.watchlist, args.workers)
+        return
+
     welcome_message()
     db_manager = None  # Инициализация переменной для дальнейшего использования
 
@@ -106,11 +144,11 @@ def main():
     # Предлагаем пользователю действия с базой данных
     while db_manager:
         action = get_user_action()
-        if action == "6":
+        if action == "7":
             print()
             exit_application()
             break
-        elif action in ["1", "2", "3", "4", "5"]:
+        elif action in ["1", "2", "3", "4", "5", "6"]:
             handle_action(action, db_manager)
         else:
             print("Неверный ввод. Попробуйте еще раз.")
@@ -0,0 +1,276 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import warnings
+from datetime import datetime
+
+import numpy as np
+import psycopg2
+
+from .config import config
+
+SNAPSHOT_DIR = 'data/salary_snapshot'
+NUMERIC_COLUMNS = ('salary_from', 'salary_to', 'published_at', 'area_code', 'currency_code')
+
+# Признаки исходных данных, по которым определяется, устарел ли снимок
+SOURCE_QUERY = """
+    SELECT COUNT(*), COALESCE(MAX(id), 0),
+           COALESCE(SUM(COALESCE(salary_from, 0)::bigint + COALESCE(salary_to, 0)), 0)
+    FROM vacancies;
+"""
+
+
+class SalarySnapshot:
+    """
+    Колоночный снимок зарплат из таблицы vacancies для векторизованной аналитики.
+
+    Каждая колонка хранится в отдельном массиве NumPy: зарплаты — float64 (NaN вместо NULL),
+    даты публикации — datetime64[D], регион и валюта — коды int32 со справочником названий.
+    """
+
+    def __init__(self, salary_from, salary_to, published_at, area_code, currency_code, areas, currencies,
+                 source=None, created_at=None):
+        self.salary_from = salary_from
+        self.salary_to = salary_to
+        self.published_at = published_at
+        self.area_code = area_code
+        self.currency_code = currency_code
+        self.areas = areas
+        self.currencies = currencies
+        self.source = source  # [количество вакансий, максимальный ID, сумма зарплат] на момент выгрузки
+        self.created_at = created_at
+
+    @classmethod
+    def from_database(cls, database_name: str) -> 'SalarySnapshot':
+        """
+        Выгружает колонки вакансий одним запросом COPY и строит из них массивы.
+
+        Кодирование делает сама СУБД: NULL превращаются в NaN/NaT, регион и валюта — в коды
+        DENSE_RANK, поэтому вывод COPY состоит только из чисел и разбирается сразу в массивы.
+
+        Args:
+            database_name: Имя базы данных с таблицей vacancies.
+
+        Returns:
+            Снимок зарплат.
+        """
+        params = config()
+        params['dbname'] = database_name
+        buffer = io.StringIO()
+        conn = psycopg2.connect(**params)
+        try:
+            # Справочники и COPY должны видеть одни и те же данные
+            conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+            with conn.cursor() as cur:
+                cur.execute(SOURCE_QUERY)
+                source = [int(value) for value in cur.fetchone()]
+                cur.execute("SELECT DISTINCT COALESCE(area, '') FROM vacancies ORDER BY 1;")
+                areas = [area or 'Не указано' for area, in cur.fetchall()]
+                cur.execute("SELECT DISTINCT COALESCE(currency, '') FROM vacancies ORDER BY 1;")
+                currencies = [currency for currency, in cur.fetchall()]
+                cur.copy_expert("""
+                    COPY (
+                        SELECT COALESCE(salary_from::float8, 'NaN'),
+                               COALESCE(salary_to::float8, 'NaN'),
+                               COALESCE((published_at::date - DATE '1970-01-01')::bigint,
+                                        (-9223372036854775808)::bigint),
+                               DENSE_RANK() OVER (ORDER BY COALESCE(area, '')) - 1,
+                               DENSE_RANK() OVER (ORDER BY COALESCE(currency, '')) - 1
+                        FROM vacancies
+                    ) TO STDOUT WITH (FORMAT csv)
+                """, buffer)
+            conn.rollback()
+        finally:
+            conn.close()
+
+        buffer.seek(0)
+        return cls.from_csv(buffer, areas, currencies, source=source,
+                            created_at=datetime.now().isoformat(timespec='seconds'))
+
+    @classmethod
+    def get_source(cls, database_name: str) -> list:
+        """
+        Возвращает признаки текущих данных таблицы vacancies: количество вакансий, максимальный ID и сумму зарплат.
+        """
+        params = config()
+        params['dbname'] = database_name
+        conn = psycopg2.connect(**params)
+        try:
+            with conn.cursor() as cur:
+                cur.execute(SOURCE_QUERY)
+                return [int(value) for value in cur.fetchone()]
+        finally:
+            conn.close()
+
+    @classmethod
+    def from_csv(cls, buffer, areas: list, currencies: list, source=None, created_at=None) -> 'SalarySnapshot':
+        """
+        Разбирает вывод COPY (зарплата от, зарплата до, день публикации от 1970-01-01, код региона,
+        код валюты) напрямую в массивы NumPy.
+
+        Args:
+            buffer: Файлоподобный объект с CSV.
+            areas: Названия регионов в порядке их кодов.
+            currencies: Коды валют в порядке их кодов.
+            source: Признаки исходных данных (см. get_source).
+            created_at: Время выгрузки снимка.
+
+        Returns:
+            Снимок зарплат.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # Пустая таблица — не ошибка
+            data = np.loadtxt(buffer, delimiter=',', ndmin=1, dtype=[
+                ('salary_from', np.float64), ('salary_to', np.float64), ('published_at', np.int64),
+                ('area_code', np.int32), ('currency_code', np.int32)])
+
+        # Минимальное значение int64 в datetime64 — это NaT
+        published_at = np.ascontiguousarray(data['published_at']).view('datetime64[D]')
+        return cls(np.ascontiguousarray(data['salary_from']), np.ascontiguousarray(data['salary_to']),
+                   published_at, np.ascontiguousarray(data['area_code']),
+                   np.ascontiguousarray(data['currency_code']), areas, currencies, source, created_at)
+
+    def save(self, path: str) -> None:
+        """
+        Сохраняет снимок на диск: по файлу .npy на колонку и справочники в labels.json.
+
+        Файлы пишутся во временный каталог, который затем подменяет path, поэтому прерванная запись
+        не оставляет в кэше колонки из разных снимков. Если подменить каталог не удалось (например,
+        его одновременно записал другой процесс), прежний снимок возвращается на место, если path
+        остался свободным, а исключение передаётся вызывающему.
+        """
+        parent = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(parent):
+            os.makedirs(parent)
+
+        tmp_path = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+        old_path = None
+        try:
+            for column in NUMERIC_COLUMNS:
+                np.save(os.path.join(tmp_path, f'{column}.npy'), getattr(self, column))
+
+            # labels.json пишется последним и служит признаком завершённой записи
+            with open(os.path.join(tmp_path, 'labels.json'), 'w', encoding='utf-8') as f:
+                json.dump({'areas': self.areas, 'currencies': self.currencies, 'source': self.source,
+                           'created_at': self.created_at}, f, ensure_ascii=False, indent=4)
+
+            if os.path.exists(path):
+                old_path = tempfile.mkdtemp(dir=parent, prefix='.old-')
+                os.replace(path, os.path.join(old_path, 'snapshot'))
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                if old_path and not os.path.exists(path):
+                    os.replace(os.path.join(old_path, 'snapshot'), path)
+                raise
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if old_path:
+                shutil.rmtree(old_path, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str) -> 'SalarySnapshot':
+        """
+        Открывает сохранённый снимок, отображая колонки в память без полного чтения файлов.
+        """
+        columns = {column: np.load(os.path.join(path, f'{column}.npy'), mmap_mode='r')
+                   for column in NUMERIC_COLUMNS}
+
+        with open(os.path.join(path, 'labels.json'), 'r', encoding='utf-8') as f:
+            labels = json.load(f)
+
+        return cls(**columns, areas=labels['areas'], currencies=labels['currencies'],
+                   source=labels.get('source'), created_at=labels.get('created_at'))
+
+    @classmethod
+    def get(cls, database_name: str, snapshot_dir: str = SNAPSHOT_DIR, refresh: bool = False) -> 'SalarySnapshot':
+        """
+        Возвращает снимок из кэша, если он соответствует текущим данным, иначе (или при refresh=True)
+        выгружает его из базы данных заново.
+
+        Снимок каждой базы данных хранится в отдельном каталоге snapshot_dir/<имя базы данных>.
+        Кэш считается устаревшим, если изменились количество вакансий, максимальный ID или сумма зарплат.
+        """
+        path = os.path.join(snapshot_dir, database_name)
+        if not refresh and os.path.exists(os.path.join(path, 'labels.json')):
+            snapshot = cls.load(path)
+            if snapshot.source == cls.get_source(database_name):
+                return snapshot
+
+        snapshot = cls.from_database(database_name)
+        try:
+            snapshot.save(path)
+        except OSError as e:
+            print(f"Не удалось сохранить снимок данных в кэш: {e}")
+            return snapshot
+        return cls.load(path)
+
+    def salaries(self, currency: str = 'RUR') -> tuple:
+        """
+        Возвращает маску и оценку зарплаты для вакансий в заданной валюте.
+
+        Оценка — середина вилки, если указаны обе границы, иначе единственная указанная граница.
+
+        Returns:
+            Кортеж (маска выбранных вакансий, массив зарплат по этой маске).
+        """
+        midpoint = np.where(np.isnan(self.salary_from), self.salary_to,
+                            np.where(np.isnan(self.salary_to), self.salary_from,
+                                     (self.salary_from + self.salary_to) / 2))
+        mask = ~np.isnan(midpoint)
+        if currency in self.currencies:
+            mask &= self.currency_code == self.currencies.index(currency)
+        else:
+            mask[:] = False
+        return mask, midpoint[mask]
+
+    def percentiles(self, q=(10, 25, 50, 75, 90), currency: str = 'RUR') -> dict:
+        """Возвращает перцентили зарплат в виде словаря {перцентиль: значение}."""
+        _, values = self.salaries(currency)
+        if not values.size:
+            return {}
+        return dict(zip(q, np.percentile(values, q).tolist()))
+
+    def histogram(self, bins: int = 10, currency: str = 'RUR') -> list:
+        """Возвращает гистограмму зарплат в виде списка (от, до, количество)."""
+        _, values = self.salaries(currency)
+        if not values.size:
+            return []
+        counts, edges = np.histogram(values, bins=bins)
+        return list(zip(edges[:-1].tolist(), edges[1:].tolist(), counts.tolist()))
+
+    def by_area(self, currency: str = 'RUR') -> list:
+        """Возвращает список (регион, количество вакансий, средняя зарплата, медиана), отсортированный по средней."""
+        mask, values = self.salaries(currency)
+        codes = self.area_code[mask]
+        if not values.size:
+            return []
+
+        counts = np.bincount(codes, minlength=len(self.areas))
+        sums = np.bincount(codes, weights=values, minlength=len(self.areas))
+        order = np.lexsort((values, codes))
+        sorted_values, sorted_codes = values[order], codes[order]
+        starts = np.searchsorted(sorted_codes, np.arange(len(self.areas)))
+
+        result = []
+        for code in np.flatnonzero(counts):
+            group = sorted_values[starts[code]:starts[code] + counts[code]]
+            result.append((self.areas[code], int(counts[code]), float(sums[code] / counts[code]),
+                           float(np.median(group))))
+        return sorted(result, key=lambda item: item[2], reverse=True)
+
+    def monthly_trend(self, currency: str = 'RUR') -> list:
+        """Возвращает список (месяц, количество вакансий, средняя зарплата) по месяцам публикации."""
+        mask, values = self.salaries(currency)
+        months = self.published_at[mask].astype('datetime64[M]')
+        known = ~np.isnat(months)
+        if not known.any():
+            return []
+
+        unique_months, codes = np.unique(months[known], return_inverse=True)
+        counts = np.bincount(codes)
+        sums = np.bincount(codes, weights=values[known])
+        return [(str(month), int(count), float(total / count))
+                for month, count, total in zip(unique_months, counts, sums)]
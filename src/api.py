@@ -1,12 +1,39 @@
+import threading
+import time
+
 import requests
 
 
 class HeadHunterAPI:
     """Класс для взаимодействия с публичным API hh.ru."""
 
-    def __init__(self):
-        """Инициализирует базовый URL для API hh.ru."""
+    request_timeout = (5, 30)  # Таймауты подключения и чтения ответа, в секундах
+
+    def __init__(self, session: requests.Session = None, min_interval: float = 0.0):
+        """
+        Инициализирует базовый URL для API hh.ru.
+
+        Args:
+            session: Общая HTTP-сессия (необязательно). Позволяет нескольким потокам переиспользовать соединения.
+            min_interval: Минимальный интервал в секундах между запросами, общий для всех потоков.
+        """
         self.base_url = 'https://api.hh.ru'
+        self.session = session or requests.Session()
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_request_at = 0.0
+
+    def _get(self, url: str, params: dict = None) -> requests.Response:
+        """
+        Выполняет GET-запрос, выдерживая min_interval между запросами, чтобы не превышать лимиты API.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+        return self.session.get(url, params=params, timeout=self.request_timeout)
 
     def get_vacancies(self, search_query: str, area: str = None, page: int = 0) -> dict:
         """
@@ -26,7 +53,7 @@ class HeadHunterAPI:
             'page': page,
             'per_page': 50  # Количество результатов на странице
         }
-        response = requests.get(f"{self.base_url}/vacancies", params=params)
+        response = self._get(f"{self.base_url}/vacancies", params=params)
         response.raise_for_status()  # Если запрос не успешен, вызывается исключение
         return response.json()
 
@@ -42,7 +69,7 @@ class HeadHunterAPI:
             str: ID региона, если найден, иначе пустая строка.
         """
         if areas is None:
-            response = requests.get(f"{self.base_url}/areas")
+            response = self._get(f"{self.base_url}/areas")
             response.raise_for_status()
             areas = response.json()
 
@@ -61,7 +88,7 @@ class HeadHunterAPI:
         Получает детальную информацию о вакансии по её ID.
         """
         try:
-            response = requests.get(f"{self.base_url}/vacancies/{vacancy_id}")
+            response = self._get(f"{self.base_url}/vacancies/{vacancy_id}")
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
@@ -73,7 +100,7 @@ class HeadHunterAPI:
         Получает список вакансий для заданной компании по её ID.
         """
         params = {'employer_id': company_id, 'page': page, 'per_page': 20}
-        response = requests.get(f"{self.base_url}/vacancies", params=params)
+        response = self._get(f"{self.base_url}/vacancies", params=params)
         response.raise_for_status()
         return response.json()
 
@@ -7,7 +7,13 @@ class DBManager:
     Класс для управления базой данных, включая операции вставки и выборки данных.
     """
 
-    def __init__(self, database_name=None):
+    def __init__(self, database_name=None, conn=None):
+        """
+        Подключается к базе данных или использует готовое соединение conn (например, взятое из пула).
+        """
+        if conn is not None:
+            self.conn = conn
+            return
         params = config()
         if database_name:
             params['dbname'] = database_name
@@ -47,6 +53,61 @@ class DBManager:
             print(f"Произошла ошибка при вставке вакансии: {e}")
             self.conn.rollback()
 
+    def upsert_vacancy(self, vacancy: dict) -> None:
+        """
+        Вставляет вакансию или обновляет уже сохранённую.
+        Пустые schedule и employment не затирают ранее сохранённые значения.
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO vacancies (id, name, area, salary_from, salary_to, currency, employer_id,
+                    published_at, url, schedule, employment)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (id) DO UPDATE SET
+                        name = EXCLUDED.name, area = EXCLUDED.area, salary_from = EXCLUDED.salary_from,
+                        salary_to = EXCLUDED.salary_to, currency = EXCLUDED.currency,
+                        employer_id = EXCLUDED.employer_id, published_at = EXCLUDED.published_at,
+                        url = EXCLUDED.url, schedule = COALESCE(EXCLUDED.schedule, vacancies.schedule),
+                        employment = COALESCE(EXCLUDED.employment, vacancies.employment);
+                """, (vacancy['id'], vacancy['name'], vacancy['area'], vacancy['salary_from'], vacancy['salary_to'],
+                      vacancy['currency'], vacancy['employer_id'], vacancy['published_at'], vacancy['url'],
+                      vacancy.get('schedule'), vacancy.get('employment')))
+                self.conn.commit()
+        except psycopg2.Error as e:
+            print(f"Произошла ошибка при обновлении вакансии: {e}")
+            self.conn.rollback()
+
+    def get_existing_vacancy_ids(self, vacancy_ids: list) -> set:
+        """
+        Возвращает множество ID из переданного списка, которые уже есть в таблице vacancies.
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT id FROM vacancies WHERE id = ANY(%s);", ([int(i) for i in vacancy_ids],))
+                existing = {row[0] for row in cur.fetchall()}
+                self.conn.commit()
+                return existing
+        except psycopg2.Error as e:
+            print(f"Произошла ошибка при проверке сохранённых вакансий: {e}")
+            self.conn.rollback()
+            return set()
+
+    def delete_closed_vacancies(self, employer_id, open_vacancy_ids: list) -> None:
+        """
+        Удаляет вакансии компании, которых больше нет среди её открытых вакансий.
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM vacancies
+                    WHERE employer_id = %s AND NOT (id = ANY(%s));
+                """, (int(employer_id), [int(i) for i in open_vacancy_ids]))
+                self.conn.commit()
+        except psycopg2.Error as e:
+            print(f"Произошла ошибка при удалении закрытых вакансий: {e}")
+            self.conn.rollback()
+
     def get_companies_and_vacancies_count(self):
         """Получает список всех компаний и количество вакансий у каждой компании."""
         try:
@@ -0,0 +1,277 @@
+import heapq
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from psycopg2.pool import ThreadedConnectionPool
+
+from .api import HeadHunterAPI
+from .config import config
+from .db_manager import DBManager
+from .utils import parse_vacancy, save_vacancy
+
+WATCHLIST_FILE = 'data/watchlist.json'
+STATUS_FILE = 'data/scheduler_status.json'
+DEFAULT_INTERVAL = 3600  # Интервал обновления по умолчанию, в секундах
+
+
+def load_watchlist(filename: str = WATCHLIST_FILE) -> list:
+    """
+    Загружает список отслеживаемых работодателей и поисковых запросов.
+
+    Формат файла — JSON-список записей вида
+    {"employer_id": "1740", "name": "Яндекс", "interval": 3600} или
+    {"query": "python", "area": "1", "interval": 7200}.
+
+    Args:
+        filename: Путь к файлу со списком.
+
+    Returns:
+        Список записей, у каждой из которых есть уникальный ключ 'key' и интервал 'interval'.
+
+    Raises:
+        ValueError: Если файл имеет неверный формат, интервал не является положительным числом
+            или одна запись встречается дважды.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    if not isinstance(entries, list):
+        raise ValueError("Список отслеживания должен быть JSON-списком записей.")
+
+    watchlist = []
+    keys = set()
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError(f"Запись {entry} должна быть JSON-объектом.")
+        if 'employer_id' in entry:
+            key = f"employer:{entry['employer_id']}"
+        elif 'query' in entry:
+            key = f"query:{entry['query']}:{entry.get('area') or ''}"
+        else:
+            raise ValueError(f"Запись {entry} должна содержать 'employer_id' или 'query'.")
+        if key in keys:
+            raise ValueError(f"Запись {entry} повторяется в списке отслеживания.")
+        keys.add(key)
+        interval = entry.get('interval', DEFAULT_INTERVAL)
+        if isinstance(interval, bool) or not isinstance(interval, (int, float)) or not interval > 0:
+            raise ValueError(f"Интервал в записи {entry} должен быть положительным числом секунд.")
+        watchlist.append({**entry, 'key': key, 'interval': interval})
+
+    return watchlist
+
+
+class RefreshScheduler:
+    """
+    Фоновый планировщик, периодически обновляющий данные по списку работодателей и запросов.
+
+    Записи хранятся в очереди с приоритетом по времени следующего обновления, поэтому первыми
+    обновляются самые устаревшие. Обновления выполняются параллельно в пуле потоков с общей
+    HTTP-сессией и общим пулом соединений с базой данных; запросы к API разнесены во времени.
+    """
+
+    def __init__(self, database_name: str, watchlist: list, max_workers: int = 4,
+                 min_request_interval: float = 0.25, status_file: str = STATUS_FILE, status_period: float = 5.0):
+        """
+        Args:
+            database_name: Имя базы данных для сохранения вакансий.
+            watchlist: Список записей из load_watchlist.
+            max_workers: Количество одновременных обновлений.
+            min_request_interval: Минимальный интервал между запросами к API, в секундах.
+            status_file: Путь к файлу со статусом и метриками обновлений.
+            status_period: Максимальный интервал между записями файла статуса, в секундах.
+        """
+        self.watchlist = {entry['key']: entry for entry in watchlist}
+        self.max_workers = max_workers
+        self.status_file = status_file
+        self.status_period = status_period
+
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_maxsize=max_workers))
+        self.api = HeadHunterAPI(session=session, min_interval=min_request_interval)
+
+        params = config()
+        params['dbname'] = database_name
+        self.pool = ThreadedConnectionPool(1, max_workers, **params)
+
+        # Первичные обновления распределяем равномерно, чтобы не запрашивать всё разом
+        now = time.time()
+        stagger = min_request_interval * 10
+        self.queue = [(now + i * stagger, key) for i, key in enumerate(self.watchlist)]
+        heapq.heapify(self.queue)
+        self.status = {key: {'last_refresh': None, 'next_due': self._format_time(due), 'lag_seconds': None,
+                             'current_lag_seconds': None, 'duration_seconds': None, 'errors': 0, 'last_error': None}
+                       for due, key in self.queue}
+
+    @staticmethod
+    def _format_time(timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds')
+
+    def refresh(self, key: str) -> None:
+        """
+        Обновляет одну запись списка, используя соединение из общего пула.
+
+        Для работодателя загружаются все страницы его вакансий, а закрытые вакансии удаляются из базы данных.
+        Для поискового запроса обрабатывается первая страница результатов.
+        Если обновление завершилось ошибкой, соединение не возвращается в пул, а закрывается:
+        после разрыва связи с PostgreSQL оно может быть уже непригодно.
+        """
+        entry = self.watchlist[key]
+        conn = self.pool.getconn()
+        failed = True
+        try:
+            db_manager = DBManager(conn=conn)
+            if 'employer_id' in entry:
+                company_id = entry['employer_id']
+                db_manager.insert_company({'id': company_id, 'name': entry.get('name', company_id),
+                                           'url': f"https://hh.ru/employer/{company_id}"})
+                vacancies, found = self._get_all_company_vacancies(company_id)
+                self._store_vacancies(db_manager, [(vacancy, company_id) for vacancy in vacancies])
+                # API отдаёт не более 2000 вакансий; по неполному списку закрытые вакансии не определить
+                if found <= len(vacancies):
+                    db_manager.delete_closed_vacancies(company_id, [vacancy['id'] for vacancy in vacancies])
+            else:
+                vacancies = self.api.get_vacancies(search_query=entry['query'], area=entry.get('area'))
+                found = []
+                for vacancy in vacancies.get('items', []):
+                    employer = vacancy.get('employer') or {}
+                    if not employer.get('id'):
+                        continue  # Анонимные работодатели не сохраняются
+                    db_manager.insert_company({'id': employer['id'], 'name': employer['name'],
+                                               'url': f"https://hh.ru/employer/{employer['id']}"})
+                    found.append((vacancy, employer['id']))
+                self._store_vacancies(db_manager, found)
+            failed = False
+        finally:
+            self.pool.putconn(conn, close=failed or bool(conn.closed))
+
+    def _get_all_company_vacancies(self, company_id: str) -> tuple:
+        """
+        Загружает все доступные страницы открытых вакансий компании.
+
+        Returns:
+            Кортеж (список вакансий, общее количество открытых вакансий по данным API).
+        """
+        vacancies = []
+        page, pages, found = 0, 1, 0
+        while page < pages:
+            response = self.api.get_company_vacancies(company_id, page)
+            vacancies.extend(response.get('items', []))
+            pages = response.get('pages', 1)
+            found = response.get('found', len(vacancies))
+            page += 1
+        return vacancies, found
+
+    def _store_vacancies(self, db_manager: DBManager, vacancies: list) -> None:
+        """
+        Сохраняет вакансии из списка пар (вакансия из выдачи API, ID работодателя).
+
+        Уже сохранённые вакансии обновляются данными из выдачи без дополнительных запросов к API,
+        детальная информация запрашивается только для новых.
+        """
+        existing = db_manager.get_existing_vacancy_ids([vacancy['id'] for vacancy, _ in vacancies])
+        for vacancy, company_id in vacancies:
+            if int(vacancy['id']) in existing:
+                db_manager.upsert_vacancy(parse_vacancy(vacancy, company_id))
+            else:
+                save_vacancy(db_manager, self.api, vacancy['id'], company_id)
+
+    def _pop_due(self, now: float, limit: int) -> list:
+        """
+        Извлекает из очереди не более limit записей, срок обновления которых наступил, начиная с самых устаревших.
+
+        Returns:
+            Список пар (время, к которому запись должна была обновиться, ключ записи).
+        """
+        due_entries = []
+        while self.queue and self.queue[0][0] <= now and len(due_entries) < limit:
+            due_entries.append(heapq.heappop(self.queue))
+        return due_entries
+
+    def write_status(self) -> None:
+        """
+        Записывает в файл статус каждой записи и текущее отставание от расписания.
+        """
+        now = time.time()
+        pending = {key: due for due, key in self.queue}
+        for key, due in pending.items():
+            self.status[key]['current_lag_seconds'] = round(max(0.0, now - due), 1)
+
+        directory = os.path.dirname(self.status_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Пишем во временный файл и подменяем им статус, чтобы читатели не видели недописанный JSON
+        fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix='.status-', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'updated_at': self._format_time(now), 'entries': self.status}, f,
+                          ensure_ascii=False, indent=4)
+            os.replace(tmp_path, self.status_file)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def run(self) -> None:
+        """
+        Запускает бесконечный цикл обновлений. Останавливается по Ctrl+C.
+        """
+        running = {}
+        print(f"Планировщик запущен: {len(self.watchlist)} записей, до {self.max_workers} обновлений одновременно.")
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while True:
+                    self._run_once(executor, running)
+        except KeyboardInterrupt:
+            print("Планировщик остановлен.")
+        finally:
+            self.pool.closeall()
+
+    def _run_once(self, executor: ThreadPoolExecutor, running: dict) -> None:
+        """
+        Выполняет одну итерацию цикла: запускает наступившие обновления, ждёт завершения любого из них
+        не дольше status_period, возвращает завершённые записи в очередь и записывает файл статуса.
+
+        Args:
+            executor: Пул потоков для обновлений.
+            running: Выполняющиеся обновления {future: (ключ записи, время запуска)}.
+        """
+        now = time.time()
+        for due, key in self._pop_due(now, self.max_workers - len(running)):
+            self.status[key]['lag_seconds'] = self.status[key]['current_lag_seconds'] = round(now - due, 1)
+            running[executor.submit(self.refresh, key)] = (key, now)
+
+        # Ждём ограниченное время, чтобы отставание в файле статуса обновлялось, даже пока все потоки заняты
+        timeout = self.status_period
+        if self.queue and len(running) < self.max_workers:
+            timeout = min(timeout, max(0.0, self.queue[0][0] - time.time()))
+        if running:
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+        else:
+            done = set()
+            time.sleep(timeout)
+
+        for future in done:
+            key, started = running.pop(future)
+            finished = time.time()
+            entry_status = self.status[key]
+            entry_status['duration_seconds'] = round(finished - started, 1)
+            try:
+                future.result()
+                entry_status['last_refresh'] = self._format_time(finished)
+            except Exception as e:
+                entry_status['errors'] += 1
+                entry_status['last_error'] = str(e)
+                print(f"Произошла ошибка при обновлении {key}: {e}")
+
+            next_due = finished + self.watchlist[key]['interval']
+            entry_status['next_due'] = self._format_time(next_due)
+            heapq.heappush(self.queue, (next_due, key))
+
+        self.write_status()
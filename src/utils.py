@@ -4,6 +4,7 @@ import os
 import psycopg2
 from .config import config
 from .db_manager import DBManager
+from .analytics import SalarySnapshot
 from datetime import datetime
 
 
@@ -150,58 +151,99 @@ def fill_database_with_companies_and_vacancies(database_name: str):
         companies = json.load(file)
 
     for company_id, company_name in companies.items():
-        # Сохраняем информацию о компании в базе данных
-        db_manager.insert_company(
-            {'id': company_id, 'name': company_name, 'url': f"https://hh.ru/employer/{company_id}"})
-
-        # Получаем вакансии для компании
-        vacancies = api.get_company_vacancies(company_id)
-        for vacancy in vacancies['items']:
-            # Детальная информация о вакансии
-            vacancy_details = api.get_vacancy_details(vacancy['id'])
-
-            # Обработка даты и времени
-            published_at_iso = vacancy_details['published_at']  # Получаем дату и время в ISO формате
-            published_at = datetime.fromisoformat(published_at_iso)  # Преобразуем в datetime объект
-            published_at_str = published_at.strftime('%Y-%m-%d')  # Преобразуем в нужный формат строки
-
-            # Обработка зарплаты
-            salary_info = vacancy_details.get('salary')
-            if salary_info:
-                salary_from = salary_info.get('from')
-                salary_to = salary_info.get('to')
-                currency = salary_info.get('currency')
-            else:
-                salary_from = None
-                salary_to = None
-                currency = None
-
-            # Обработка остальных данных
-            area = vacancy_details['area']['name']
-            url = vacancy_details.get('alternate_url', '')
-            schedule = vacancy_details.get('schedule', {}).get('name', '')
-            employment = vacancy_details.get('employment', {}).get('name', '')
-
-            # Сохранение информации о вакансии в базе данных
-            db_manager.insert_vacancy({
-                'id': vacancy_details['id'],
-                'name': vacancy_details['name'],
-                'area': area,
-                'salary_from': salary_from,
-                'salary_to': salary_to,
-                'currency': currency,
-                'employer_id': company_id,
-                'published_at': published_at_str,
-                'url': url,
-                'schedule': schedule,
-                'employment': employment
-                # Добавьте остальные поля здесь
-            })
+        save_company_vacancies(db_manager, api, company_id, company_name)
 
     db_manager.close()
     print("База данных успешно заполнена выбранными компаниями и их вакансиями.")
 
 
+def save_company_vacancies(db_manager: DBManager, api: HeadHunterAPI, company_id: str, company_name: str) -> None:
+    """
+    Сохраняет компанию и её текущие вакансии в базе данных.
+
+    Args:
+        db_manager: Менеджер базы данных.
+        api: Экземпляр API hh.ru.
+        company_id: ID компании на hh.ru.
+        company_name: Название компании.
+    """
+    # Сохраняем информацию о компании в базе данных
+    db_manager.insert_company(
+        {'id': company_id, 'name': company_name, 'url': f"https://hh.ru/employer/{company_id}"})
+
+    # Получаем вакансии для компании
+    vacancies = api.get_company_vacancies(company_id)
+    for vacancy in vacancies['items']:
+        save_vacancy(db_manager, api, vacancy['id'], company_id)
+
+
+def save_vacancy(db_manager: DBManager, api: HeadHunterAPI, vacancy_id: str, company_id: str) -> None:
+    """
+    Загружает детальную информацию о вакансии и сохраняет её в базе данных.
+
+    Args:
+        db_manager: Менеджер базы данных.
+        api: Экземпляр API hh.ru.
+        vacancy_id: ID вакансии на hh.ru.
+        company_id: ID компании-работодателя.
+    """
+    # Детальная информация о вакансии
+    vacancy_details = api.get_vacancy_details(vacancy_id)
+    if not vacancy_details:
+        return
+
+    # Сохранение информации о вакансии в базе данных
+    db_manager.insert_vacancy(parse_vacancy(vacancy_details, company_id))
+
+
+def parse_vacancy(vacancy_data: dict, company_id: str) -> dict:
+    """
+    Преобразует вакансию из ответа API hh.ru (детальную или из списка) в запись для таблицы vacancies.
+
+    Args:
+        vacancy_data: Данные вакансии из API.
+        company_id: ID компании-работодателя.
+
+    Returns:
+        Словарь с полями таблицы vacancies.
+    """
+    # Обработка даты и времени
+    published_at_iso = vacancy_data['published_at']  # Получаем дату и время в ISO формате
+    published_at = datetime.fromisoformat(published_at_iso)  # Преобразуем в datetime объект
+    published_at_str = published_at.strftime('%Y-%m-%d')  # Преобразуем в нужный формат строки
+
+    # Обработка зарплаты
+    salary_info = vacancy_data.get('salary')
+    if salary_info:
+        salary_from = salary_info.get('from')
+        salary_to = salary_info.get('to')
+        currency = salary_info.get('currency')
+    else:
+        salary_from = None
+        salary_to = None
+        currency = None
+
+    # Обработка остальных данных; в списке вакансий schedule и employment могут отсутствовать
+    area = vacancy_data['area']['name']
+    url = vacancy_data.get('alternate_url', '')
+    schedule = (vacancy_data.get('schedule') or {}).get('name')
+    employment = (vacancy_data.get('employment') or {}).get('name')
+
+    return {
+        'id': vacancy_data['id'],
+        'name': vacancy_data['name'],
+        'area': area,
+        'salary_from': salary_from,
+        'salary_to': salary_to,
+        'currency': currency,
+        'employer_id': company_id,
+        'published_at': published_at_str,
+        'url': url,
+        'schedule': schedule,
+        'employment': employment
+    }
+
+
 def get_user_action():
     print("\nВыберите действие:")
     print("1 - Получить список всех компаний и количество вакансий у каждой компании")
@@ -209,7 +251,8 @@ def get_user_action():
     print("3 - Получить среднюю зарплату по вакансиям")
     print("4 - Получить список всех вакансий с зарплатой выше средней")
     print("5 - Найти вакансии по ключевому слову")
-    print("6 - Выйти из программы")
+    print("6 - Получить статистику зарплат (перцентили, гистограмма, регионы, динамика)")
+    print("7 - Выйти из программы")
     action = input("Ваш выбор: ")
     return action
 
@@ -268,6 +311,27 @@ def handle_action(action, db_manager):
                 f"   Зарплата: от {salary_from} до {salary_to} руб.\n   (ссылка: {url})\n"
             )
 
+    elif action == "6":
+        refresh = input("Обновить снимок данных из базы? (да/нет): ").strip().lower() == "да"
+        snapshot = SalarySnapshot.get(db_manager.conn.info.dbname, refresh=refresh)
+        print(f"Снимок данных от {snapshot.created_at}")
+
+        print("Перцентили зарплат:")
+        for q, value in snapshot.percentiles().items():
+            print(f"   {q}%: {value:,.2f} руб.")
+
+        print("Распределение зарплат:")
+        for low, high, count in snapshot.histogram():
+            print(f"   {low:,.0f} - {high:,.0f} руб.: {count}")
+
+        print("Зарплаты по регионам:")
+        for area, count, avg_salary, median_salary in snapshot.by_area():
+            print(f"   {area}: {count} вакансий, средняя {avg_salary:,.2f} руб., медиана {median_salary:,.2f} руб.")
+
+        print("Динамика по месяцам публикации:")
+        for month, count, avg_salary in snapshot.monthly_trend():
+            print(f"   {month}: {count} вакансий, средняя {avg_salary:,.2f} руб.")
+
 
 def check_database_exists(db_name: str) -> bool:
     """
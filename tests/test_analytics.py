@@ -0,0 +1,136 @@
+import io
+import os
+
+import numpy as np
+import pytest
+
+from src.analytics import SalarySnapshot
+
+
+@pytest.fixture
+def snapshot():
+    """Снимок из четырёх вакансий: две в Москве, одна в Казани, одна в долларах."""
+    return SalarySnapshot(
+        salary_from=np.array([100000, np.nan, 50000, 3000], dtype=np.float64),
+        salary_to=np.array([200000, 80000, np.nan, 5000], dtype=np.float64),
+        published_at=np.array(['2024-03-01', '2024-03-15', 'NaT', '2024-04-01'], dtype='datetime64[D]'),
+        area_code=np.array([1, 1, 0, 1], dtype=np.int32),
+        currency_code=np.array([0, 0, 0, 1], dtype=np.int32),
+        areas=['Казань', 'Москва'],
+        currencies=['RUR', 'USD'],
+    )
+
+
+@pytest.fixture
+def empty_snapshot():
+    return SalarySnapshot.from_csv(io.StringIO(''), [], [])
+
+
+def test_salaries_uses_midpoint_or_single_bound(snapshot):
+    mask, values = snapshot.salaries()
+    assert mask.tolist() == [True, True, True, False]
+    assert values.tolist() == [150000, 80000, 50000]
+
+
+def test_salaries_unknown_currency(snapshot):
+    _, values = snapshot.salaries('EUR')
+    assert values.size == 0
+
+
+def test_percentiles(snapshot):
+    assert snapshot.percentiles(q=(0, 50, 100)) == {0: 50000, 50: 80000, 100: 150000}
+    assert snapshot.percentiles(q=(50,), currency='USD') == {50: 4000}
+
+
+def test_histogram(snapshot):
+    histogram = snapshot.histogram(bins=2)
+    assert histogram == [(50000, 100000, 2), (100000, 150000, 1)]
+
+
+def test_by_area(snapshot):
+    assert snapshot.by_area() == [('Москва', 2, 115000, 115000), ('Казань', 1, 50000, 50000)]
+
+
+def test_monthly_trend_skips_unknown_dates(snapshot):
+    assert snapshot.monthly_trend() == [('2024-03', 2, 115000)]
+
+
+def test_empty_snapshot(empty_snapshot):
+    assert empty_snapshot.percentiles() == {}
+    assert empty_snapshot.histogram() == []
+    assert empty_snapshot.by_area() == []
+    assert empty_snapshot.monthly_trend() == []
+
+
+def test_from_csv_decodes_nulls():
+    buffer = io.StringIO('100000,NaN,19783,0,0\nNaN,NaN,-9223372036854775808,0,0\n')
+    snapshot = SalarySnapshot.from_csv(buffer, ['Москва'], ['RUR'])
+    assert snapshot.published_at[0] == np.datetime64('2024-03-01')
+    assert np.isnat(snapshot.published_at[1])
+    assert np.isnan(snapshot.salary_to).all()
+    assert snapshot.percentiles(q=(50,)) == {50: 100000}
+
+
+def test_save_and_load_roundtrip(snapshot, tmp_path):
+    path = os.path.join(tmp_path, 'hh')
+    snapshot.save(path)
+    snapshot.save(path)  # Повторная запись подменяет каталог целиком
+
+    loaded = SalarySnapshot.load(path)
+    assert isinstance(loaded.salary_from, np.memmap)
+    assert loaded.by_area() == snapshot.by_area()
+    assert os.listdir(tmp_path) == ['hh']
+
+
+def test_get_keeps_separate_cache_per_database(snapshot, tmp_path, monkeypatch):
+    other = SalarySnapshot.from_csv(io.StringIO('1000,2000,19783,0,0\n'), ['Казань'], ['RUR'])
+    snapshots = {'first': snapshot, 'second': other}
+    monkeypatch.setattr(SalarySnapshot, 'from_database', classmethod(lambda cls, name: snapshots[name]))
+    monkeypatch.setattr(SalarySnapshot, 'get_source', classmethod(lambda cls, name: None))
+
+    assert SalarySnapshot.get('first', snapshot_dir=tmp_path).percentiles() == snapshot.percentiles()
+    assert SalarySnapshot.get('second', snapshot_dir=tmp_path).percentiles() == other.percentiles()
+
+    snapshots.clear()  # Повторный запрос берётся из кэша
+    assert SalarySnapshot.get('first', snapshot_dir=tmp_path).percentiles() == snapshot.percentiles()
+
+
+def test_get_rebuilds_stale_cache(tmp_path, monkeypatch):
+    versions = iter([
+        SalarySnapshot.from_csv(io.StringIO('1000,2000,19783,0,0\n'), ['Казань'], ['RUR'],
+                                source=[1, 10, 3000], created_at='2024-03-01T10:00:00'),
+        SalarySnapshot.from_csv(io.StringIO('1000,2000,19783,0,0\n5000,NaN,19783,0,0\n'), ['Казань'], ['RUR'],
+                                source=[2, 11, 8000], created_at='2024-03-02T10:00:00'),
+    ])
+    source = [1, 10, 3000]
+    monkeypatch.setattr(SalarySnapshot, 'from_database', classmethod(lambda cls, name: next(versions)))
+    monkeypatch.setattr(SalarySnapshot, 'get_source', classmethod(lambda cls, name: source))
+
+    assert SalarySnapshot.get('hh', snapshot_dir=tmp_path).created_at == '2024-03-01T10:00:00'
+    assert SalarySnapshot.get('hh', snapshot_dir=tmp_path).created_at == '2024-03-01T10:00:00'
+
+    source = [2, 11, 8000]  # В базу данных добавилась вакансия
+    refreshed = SalarySnapshot.get('hh', snapshot_dir=tmp_path)
+    assert refreshed.created_at == '2024-03-02T10:00:00'
+    assert refreshed.source == [2, 11, 8000]
+    assert refreshed.percentiles(q=(50,)) == {50: 3250}
+
+
+def test_save_restores_previous_snapshot_on_failure(snapshot, tmp_path, monkeypatch):
+    path = os.path.join(tmp_path, 'hh')
+    snapshot.save(path)
+
+    replace = os.replace
+
+    def failing_replace(src, dst):
+        if os.path.basename(src).startswith('.tmp-'):
+            raise OSError('диск заполнен')
+        replace(src, dst)
+
+    monkeypatch.setattr(os, 'replace', failing_replace)
+    other = SalarySnapshot.from_csv(io.StringIO('1000,2000,19783,0,0\n'), ['Казань'], ['RUR'])
+    with pytest.raises(OSError):
+        other.save(path)
+
+    assert os.listdir(tmp_path) == ['hh']
+    assert SalarySnapshot.load(path).by_area() == snapshot.by_area()
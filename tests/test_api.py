@@ -0,0 +1,44 @@
+import time
+
+from src.api import HeadHunterAPI
+
+
+class FakeSession:
+    """Вместо HTTP-запроса возвращает момент, когда запрос был бы отправлен."""
+
+    def __init__(self):
+        self.timeouts = []
+
+    def get(self, url, params=None, timeout=None):
+        self.timeouts.append(timeout)
+        return time.monotonic()
+
+
+def test_get_spaces_requests_by_min_interval():
+    api = HeadHunterAPI(session=FakeSession(), min_interval=0.05)
+    sent = [api._get('https://api.hh.ru/vacancies') for _ in range(4)]
+    gaps = [later - earlier for earlier, later in zip(sent, sent[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
+
+
+def test_get_without_interval_does_not_wait():
+    api = HeadHunterAPI(session=FakeSession())
+    started = time.monotonic()
+    for _ in range(100):
+        api._get('https://api.hh.ru/vacancies')
+    assert time.monotonic() - started < 0.05
+
+
+def test_get_does_not_wait_after_idle_period():
+    api = HeadHunterAPI(session=FakeSession(), min_interval=0.05)
+    api._get('https://api.hh.ru/vacancies')
+    time.sleep(0.06)
+    started = time.monotonic()
+    api._get('https://api.hh.ru/vacancies')
+    assert time.monotonic() - started < 0.02
+
+
+def test_get_passes_timeout():
+    session = FakeSession()
+    HeadHunterAPI(session=session)._get('https://api.hh.ru/vacancies')
+    assert session.timeouts == [HeadHunterAPI.request_timeout]
@@ -0,0 +1,250 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import scheduler as scheduler_module
+from src.scheduler import RefreshScheduler, load_watchlist
+
+
+class FakeConnection:
+    closed = 0
+
+
+class FakePool:
+    def __init__(self, minconn, maxconn, **params):
+        self.returned = []
+
+    def getconn(self):
+        return FakeConnection()
+
+    def putconn(self, conn, close=False):
+        self.returned.append(close)
+
+    def closeall(self):
+        pass
+
+
+class FakeDBManager:
+    """Запоминает вызовы вместо работы с PostgreSQL; сохранёнными считаются вакансии из existing."""
+    existing = set()
+    calls = []
+
+    def __init__(self, database_name=None, conn=None):
+        pass
+
+    def insert_company(self, company):
+        self.calls.append(('insert_company', company['id']))
+
+    def get_existing_vacancy_ids(self, vacancy_ids):
+        return {int(i) for i in vacancy_ids} & self.existing
+
+    def upsert_vacancy(self, vacancy):
+        self.calls.append(('upsert_vacancy', vacancy['id'], vacancy['salary_from']))
+
+    def insert_vacancy(self, vacancy):
+        self.calls.append(('insert_vacancy', vacancy['id']))
+
+    def delete_closed_vacancies(self, employer_id, open_vacancy_ids):
+        self.calls.append(('delete_closed_vacancies', employer_id, sorted(open_vacancy_ids)))
+
+
+class FakeAPI:
+    def __init__(self, found=3):
+        self.details_requested = []
+        self.found = found
+
+    def get_company_vacancies(self, company_id, page=0):
+        pages = [[vacancy('1', 100000), vacancy('2', 150000)], [vacancy('3', 200000)]]
+        return {'items': pages[page], 'pages': len(pages), 'found': self.found}
+
+    def get_vacancy_details(self, vacancy_id):
+        self.details_requested.append(vacancy_id)
+        return vacancy(vacancy_id, 300000)
+
+
+def vacancy(vacancy_id, salary_from):
+    return {'id': vacancy_id, 'name': 'Python-разработчик', 'area': {'name': 'Москва'},
+            'salary': {'from': salary_from, 'to': None, 'currency': 'RUR'},
+            'published_at': '2024-03-01T10:00:00+0300', 'alternate_url': f'https://hh.ru/vacancy/{vacancy_id}'}
+
+
+def write_watchlist(tmp_path, entries):
+    path = os.path.join(tmp_path, 'watchlist.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False)
+    return path
+
+
+@pytest.fixture
+def make_scheduler(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler_module, 'config', lambda: {})
+    monkeypatch.setattr(scheduler_module, 'ThreadedConnectionPool', FakePool)
+    monkeypatch.setattr(scheduler_module, 'DBManager', FakeDBManager)
+    FakeDBManager.existing = set()
+    FakeDBManager.calls = []
+
+    def make(entries):
+        watchlist = load_watchlist(write_watchlist(tmp_path, entries))
+        return RefreshScheduler('hh', watchlist, max_workers=2, status_period=0.5,
+                                status_file=os.path.join(tmp_path, 'status', 'status.json'))
+
+    return make
+
+
+def test_load_watchlist_builds_keys_and_default_interval(tmp_path):
+    path = write_watchlist(tmp_path, [
+        {'employer_id': '1740', 'name': 'Яндекс', 'interval': 600},
+        {'query': 'python', 'area': '1'},
+        {'query': 'python'},
+    ])
+    watchlist = load_watchlist(path)
+    assert [entry['key'] for entry in watchlist] == ['employer:1740', 'query:python:1', 'query:python:']
+    assert [entry['interval'] for entry in watchlist] == [600, 3600, 3600]
+
+
+@pytest.mark.parametrize('entries', [
+    {'employer_id': '1740'},
+    [{'name': 'Яндекс'}],
+    ['1740'],
+    [{'employer_id': '1740', 'interval': 600}, {'employer_id': '1740', 'interval': 60}],
+    [{'query': 'python', 'area': '1'}, {'query': 'python', 'area': '1'}],
+    [{'employer_id': '1', 'interval': '3600'}],
+    [{'employer_id': '1', 'interval': 0}],
+    [{'employer_id': '1', 'interval': -60}],
+    [{'employer_id': '1', 'interval': True}],
+    [{'employer_id': '1', 'interval': None}],
+])
+def test_load_watchlist_rejects_invalid_entries(tmp_path, entries):
+    with pytest.raises(ValueError):
+        load_watchlist(write_watchlist(tmp_path, entries))
+
+
+def test_initial_refreshes_are_staggered(make_scheduler):
+    scheduler = make_scheduler([{'employer_id': str(i)} for i in range(3)])
+    dues = sorted(scheduler.queue)
+    assert [key for _, key in dues] == ['employer:0', 'employer:1', 'employer:2']
+    assert dues[0][0] < dues[1][0] < dues[2][0]
+
+
+def test_pop_due_returns_stalest_first_up_to_limit(make_scheduler):
+    scheduler = make_scheduler([{'employer_id': str(i)} for i in range(4)])
+    scheduler.queue = []
+    for due, key in [(50, 'employer:0'), (10, 'employer:1'), (200, 'employer:2'), (30, 'employer:3')]:
+        scheduler_module.heapq.heappush(scheduler.queue, (due, key))
+
+    assert scheduler._pop_due(100, limit=2) == [(10, 'employer:1'), (30, 'employer:3')]
+    assert scheduler._pop_due(100, limit=2) == [(50, 'employer:0')]
+    assert scheduler._pop_due(100, limit=2) == []
+    assert scheduler.queue == [(200, 'employer:2')]
+
+
+def test_write_status_replaces_file(make_scheduler):
+    scheduler = make_scheduler([{'employer_id': '1740'}])
+    scheduler.write_status()
+    scheduler.write_status()
+
+    directory = os.path.dirname(scheduler.status_file)
+    assert os.listdir(directory) == ['status.json']
+    with open(scheduler.status_file, 'r', encoding='utf-8') as f:
+        status = json.load(f)
+    assert set(status['entries']) == {'employer:1740'}
+    assert status['entries']['employer:1740']['errors'] == 0
+
+
+def test_refresh_updates_known_vacancies_without_details(make_scheduler):
+    scheduler = make_scheduler([{'employer_id': '1740', 'name': 'Яндекс'}])
+    scheduler.api = FakeAPI()
+    FakeDBManager.existing = {1, 3}
+
+    scheduler.refresh('employer:1740')
+
+    assert scheduler.api.details_requested == ['2']
+    assert FakeDBManager.calls == [
+        ('insert_company', '1740'),
+        ('upsert_vacancy', '1', 100000),
+        ('insert_vacancy', '2'),
+        ('upsert_vacancy', '3', 200000),
+        ('delete_closed_vacancies', '1740', ['1', '2', '3']),
+    ]
+    assert scheduler.pool.returned == [False]
+
+
+def test_refresh_keeps_vacancies_beyond_api_limit(make_scheduler):
+    scheduler = make_scheduler([{'employer_id': '1740', 'name': 'Яндекс'}])
+    scheduler.api = FakeAPI(found=2500)  # Выдача API обрезана, часть открытых вакансий не получена
+
+    scheduler.refresh('employer:1740')
+
+    assert not [call for call in FakeDBManager.calls if call[0] == 'delete_closed_vacancies']
+
+
+def test_refresh_discards_connection_after_error(make_scheduler):
+    scheduler = make_scheduler([{'employer_id': '1740', 'name': 'Яндекс'}])
+
+    class BrokenAPI(FakeAPI):
+        def get_company_vacancies(self, company_id, page=0):
+            raise ConnectionError('нет соединения')
+
+    scheduler.api = BrokenAPI()
+    with pytest.raises(ConnectionError):
+        scheduler.refresh('employer:1740')
+    assert scheduler.pool.returned == [True]
+
+
+def run_until_done(scheduler, executor, running):
+    scheduler._run_once(executor, running)
+    deadline = time.time() + 5
+    while running and time.time() < deadline:
+        scheduler._run_once(executor, running)
+    assert not running
+
+
+def test_run_once_records_errors_and_reschedules(make_scheduler, monkeypatch):
+    scheduler = make_scheduler([{'employer_id': '1740', 'interval': 60}])
+    outcomes = [ConnectionError('нет соединения'), None]
+
+    def fake_refresh(key):
+        outcome = outcomes.pop(0)
+        if outcome:
+            raise outcome
+
+    monkeypatch.setattr(scheduler, 'refresh', fake_refresh)
+    scheduler.queue = [(time.time() - 10, 'employer:1740')]
+    running = {}
+    with ThreadPoolExecutor(max_workers=scheduler.max_workers) as executor:
+        started = time.time()
+        run_until_done(scheduler, executor, running)
+        status = scheduler.status['employer:1740']
+        assert status['errors'] == 1
+        assert status['last_error'] == 'нет соединения'
+        assert status['last_refresh'] is None
+        assert status['lag_seconds'] >= 10
+        [(next_due, key)] = scheduler.queue
+        assert key == 'employer:1740'
+        assert started + 60 <= next_due <= time.time() + 60
+
+        scheduler.queue = [(time.time(), 'employer:1740')]
+        run_until_done(scheduler, executor, running)
+        assert status['errors'] == 1
+        assert status['last_refresh'] is not None
+        assert len(scheduler.queue) == 1
+
+    with open(scheduler.status_file, 'r', encoding='utf-8') as f:
+        assert json.load(f)['entries']['employer:1740']['errors'] == 1
+
+
+def test_run_once_updates_status_while_workers_are_busy(make_scheduler, monkeypatch):
+    scheduler = make_scheduler([{'employer_id': str(i)} for i in range(3)])
+    monkeypatch.setattr(scheduler, 'refresh', lambda key: time.sleep(2))
+    scheduler.queue = [(time.time() - 5, f'employer:{i}') for i in range(3)]
+    running = {}
+    with ThreadPoolExecutor(max_workers=scheduler.max_workers) as executor:
+        started = time.time()
+        scheduler._run_once(executor, running)
+        assert time.time() - started < 1.5  # Ожидание ограничено status_period
+        assert len(running) == 2
+        with open(scheduler.status_file, 'r', encoding='utf-8') as f:
+            assert json.load(f)['entries']['employer:2']['current_lag_seconds'] >= 5